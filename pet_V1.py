@@ -1,7 +1,10 @@
 import sys
 import os
+import bisect
 import random
 import threading
+import time
+from collections import deque
 import psutil  # pip install psutil
 
 # [新增] 尝试导入 pynvml 用于 GPU 监测
@@ -12,9 +15,11 @@ try:
 except ImportError:
     HAS_PYNVML = False
 
-from PyQt5.QtWidgets import QApplication, QMainWindow, QMenu, QAction, QSystemTrayIcon, QActionGroup
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMenu, QAction, QSystemTrayIcon, QActionGroup, QLabel
 from PyQt5.QtCore import QTimer, Qt, QPoint
-from PyQt5.QtGui import QPixmap, QPainter, QTransform, QIcon
+from PyQt5.QtGui import QPixmap, QIcon, QImage
 
 # ==========================================
 # 1. 配置区域
@@ -23,9 +28,27 @@ IMG_DIR = "./img_quan"
 # IMG_DIR = "./img_cat"
 RUNCAT_DIR = "./icons/cat2/processed"
 MAX_PETS = 5
+MONITOR_INTERVAL_MS = 2000  # 硬件采样周期，托盘动画对 1 秒内的波动并不敏感
 FLOOR_OFFSET = 50
 RIGHT_WALL_OFFSET = 55
 
+# pynvml 进程级只允许初始化一次，句柄在这里缓存
+_NVML_STATE = {"inited": False, "handle": None}
+
+
+def _ensure_nvml():
+    if _NVML_STATE["inited"]:
+        return _NVML_STATE["handle"]
+    _NVML_STATE["inited"] = True
+    if HAS_PYNVML:
+        try:
+            pynvml.nvmlInit()
+            _NVML_STATE["handle"] = pynvml.nvmlDeviceGetHandleByIndex(0)
+        except Exception as e:
+            print(f"GPU Init Failed: {e}")
+    return _NVML_STATE["handle"]
+
+
 ACTIONS = {
     # --- 出生 ---
     "born": [{"img": f"born{i:05d}.png", "dur": 300} for i in range(6)],
@@ -57,6 +80,38 @@ ACTIONS = {
     "struggle": [{"img": f"struggle{i:05d}.png", "dur": 120} for i in range(3)],
 }
 
+# 帧配置摊平成元组表，按索引取值比逐帧查 dict 快一倍左右
+ACTIONS_IMG = {state: tuple(f["img"] for f in frames) for state, frames in ACTIONS.items()}
+ACTIONS_DUR = {state: tuple(f["dur"] for f in frames) for state, frames in ACTIONS.items()}
+
+# 状态分组用 frozenset，成员判断 O(1) 且不会每帧新建列表
+_STATIC_STATES = frozenset(("born", "sit", "sitloop", "sit_idle", "standup", "struggle"))
+_AIR_STATES = frozenset(("fly", "drop", "drag_throw"))
+_WALL_STATES = frozenset(("wall_idle", "wall_climb", "wall_descend"))
+_FLOOR_STATES = frozenset(("idle", "walk", "run", "ie_walk"))
+_FLOOR_MOVE_STATES = frozenset(("walk", "run", "ie_walk"))
+_NO_SCREEN_UPDATE_STATES = frozenset(("wall_climb", "wall_descend", "wall_idle", "ceiling_walk"))
+# 长时驻留的单帧状态：固定时除动画推进外无事可做
+_RESTING_STATES = frozenset(("idle", "sit_idle", "wall_idle"))
+
+# state -> 物理处理函数，类定义后填充 (见文件底部)
+_STATE_HANDLERS = {}
+
+# 状态位掩码：set_state 时缓存到实例上，
+# 热循环里一次整数与运算代替多次集合成员判断
+_MASK_STATIC, _MASK_AIR, _MASK_WALL, _MASK_CEILING, _MASK_FLOOR = 1, 2, 4, 8, 16
+_STATE_MASK = {}
+_STATE_MASK.update(dict.fromkeys(_STATIC_STATES, _MASK_STATIC))
+_STATE_MASK.update(dict.fromkeys(_AIR_STATES, _MASK_AIR))
+_STATE_MASK.update(dict.fromkeys(_WALL_STATES, _MASK_WALL))
+_STATE_MASK["ceiling_walk"] = _MASK_CEILING
+_STATE_MASK.update(dict.fromkeys(_FLOOR_STATES, _MASK_FLOOR))
+
+# 爬到墙顶后的行为选择：预计算累积权重 (20/30/30/20)，
+# 免去 random.choices 每次重建累积表和临时列表
+_WALL_TOP_OPTS = ("idle", "descend", "ceiling", "jump")
+_WALL_TOP_CUM = (20, 50, 80, 100)
+
 
 # ==========================================
 # 2. 全局管理器
@@ -64,9 +119,43 @@ ACTIONS = {
 class PetManager:
     def __init__(self):
         self.pets = []
+        self.desktop = None
+        self._tick = None
+        self._geom = {}
+
+    def get_desktop(self):
+        if self.desktop is None:
+            self.desktop = QApplication.desktop()
+            # 屏幕布局变化时让几何缓存失效
+            self.desktop.resized.connect(self._flush_geom_cache)
+            self.desktop.screenCountChanged.connect(self._flush_geom_cache)
+        return self.desktop
+
+    def get_geom(self, screen_num):
+        """按屏幕号缓存 availableGeometry，省去 Qt 内部每次遍历屏幕列表"""
+        rect = self._geom.get(screen_num)
+        if rect is None:
+            rect = self.desktop.availableGeometry(screen_num)
+            self._geom[screen_num] = rect
+        return rect
+
+    def _flush_geom_cache(self, *args):
+        self._geom.clear()
+
+    def _ensure_tick(self):
+        """所有宠物共用一个 30ms 定时器，避免 N 个 QTimer 各自唤醒事件循环"""
+        if self._tick is None and QApplication.instance():
+            self._tick = QTimer()
+            self._tick.timeout.connect(self._tick_all)
+            self._tick.start(30)
+
+    def _tick_all(self):
+        for pet in list(self.pets):
+            pet.update_tick()
 
     def add_pet(self, pet):
         self.pets.append(pet)
+        self._ensure_tick()
         self.sort_windows()
 
     def remove_pet(self, pet):
@@ -88,6 +177,10 @@ manager = PetManager()
 # 3. 桌面宠物类
 # ==========================================
 class DesktopPet(QMainWindow):
+    # 类级资源缓存：图片与帧表只构建一次，所有分身共享
+    _img_cache = {}
+    _frame_table = {}
+
     def __init__(self, start_pos=None, start_state="drop"):
         super().__init__()
 
@@ -96,13 +189,18 @@ class DesktopPet(QMainWindow):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_ShowWithoutActivating)
 
-        # --- 多屏幕管理 ---
-        self.desktop = QApplication.desktop()
+        # 精灵通过 QLabel 子控件显示，Qt 自行走 backing-store 合成，
+        # 不再需要每帧在 paintEvent 里搭建 QPainter
+        self._label = QLabel(self)
+        self._label.setAttribute(Qt.WA_TransparentForMouseEvents)
+
+        # --- 多屏幕管理 (desktop 引用与几何缓存挂在 manager 上共享) ---
+        self.desktop = manager.get_desktop()
 
         if start_pos:
             self.x, self.y = start_pos
         else:
-            primary_rect = self.desktop.availableGeometry(self.desktop.primaryScreen())
+            primary_rect = manager.get_geom(self.desktop.primaryScreen())
             center_x = primary_rect.center().x() - 64
             self.x = center_x
             self.y = primary_rect.top() - 128
@@ -110,6 +208,8 @@ class DesktopPet(QMainWindow):
         self.update_screen_info(force_update=True)
 
         self.state = start_state
+        self._mask = _STATE_MASK.get(start_state, 0)
+        self._phys = _STATE_HANDLERS.get(start_state)
         self.look_right = True
 
         # --- 物理参数 ---
@@ -124,20 +224,20 @@ class DesktopPet(QMainWindow):
         # --- 交互参数 ---
         self.frame_index = 0
         self.frame_timer = 0
+        self._last_tick_ns = time.monotonic_ns()
         self.is_dragging = False
-        self.mouse_history = []
+        self.mouse_history = deque(maxlen=6)
         self.drag_offset = QPoint(0, 0)
         self.last_drag_x = 0
         self.ceiling_dist = 0
 
-        # --- 资源加载 ---
-        self.img_cache = {}
-        self.preload_images()
+        # --- 资源加载 (所有宠物共享同一份类级缓存，只加载一次) ---
+        self.pixmap = None
+        self._last_geom = None
+        if not DesktopPet._frame_table:
+            DesktopPet._build_frame_table()
 
-        # --- 核心定时器 ---
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_tick)
-        self.timer.start(30)
+        # 核心循环由 manager 的共享定时器驱动 (见 PetManager._tick_all)
 
         # --- 托盘图标与 RunCat 初始化 ---
         # 即使不是第一个宠物，为了支持 RunCat 的数据更新逻辑，
@@ -148,27 +248,47 @@ class DesktopPet(QMainWindow):
         # ----------------------------
 
         self.update_image()
-        self.move(int(self.x), int(self.y))
+        self._apply_geometry()
         self.show()
 
-    def preload_images(self):
+    @classmethod
+    def _build_frame_table(cls):
         if not os.path.exists(IMG_DIR):
             return
-        transform = QTransform().scale(-1, 1)
-
-        def load_file(name):
-            if name in self.img_cache: return
-            path = os.path.join(IMG_DIR, name)
-            pix = QPixmap(path)
-            if pix.isNull():
+        cache = cls._img_cache
+
+        names = []
+        seen = set()
+        for img_names in ACTIONS_IMG.values():
+            for name in img_names:
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+
+        # PNG 解码是 CPU 密集操作且会释放 GIL，QImage 可以在工作线程里构造；
+        # QPixmap 必须在 GUI 线程创建，所以转换留在主线程完成
+        paths = [os.path.join(IMG_DIR, n) for n in names]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            images = list(pool.map(QImage, paths))
+
+        for name, img in zip(names, images):
+            if img.isNull():
                 pix = QPixmap(128, 128)
                 pix.fill(Qt.transparent)
-            self.img_cache[name] = pix
-            self.img_cache[name + "_r"] = pix.transformed(transform)
-
-        for frames_list in ACTIONS.values():
-            for frame_data in frames_list:
-                load_file(frame_data["img"])
+                cache[name] = pix
+                cache[name + "_r"] = pix
+            else:
+                cache[name] = QPixmap.fromImage(img)
+                # 纯水平镜像走 QImage.mirrored 的逐行快速路径，
+                # 比通用仿射 transformed 便宜得多
+                cache[name + "_r"] = QPixmap.fromImage(img.mirrored(True, False))
+
+        # 预先把每个状态的帧解析成 (正向, 镜像) 元组表，
+        # 热循环里只需按索引取值，省去每帧的字典查找和字符串拼接
+        cls._frame_table = {
+            state: tuple((cache[name], cache[name + "_r"]) for name in img_names)
+            for state, img_names in ACTIONS_IMG.items()
+        }
 
     # ==========================================
     # [新增] 托盘菜单与 RunCat 逻辑
@@ -226,16 +346,15 @@ class DesktopPet(QMainWindow):
         self.tray.show()
 
         # 启动 RunCat 动画循环
-        self.update_runcat_icon()
+        self._runcat_timer.start(200)
 
     def init_runcat(self):
         """初始化监测资源"""
         self.monitor_mode = "cpu"  # 默认模式: 'cpu', 'mem', 'gpu'
         self.current_usage = 0.0
+        self._usage = {"cpu": 0.0, "mem": 0.0, "gpu": 0.0}
         self.runcat_frame_index = 0
         self.runcat_icons = []
-        self.has_gpu = False
-        self.gpu_handle = None
 
         # 加载动画图片
         if os.path.exists(RUNCAT_DIR):
@@ -246,25 +365,33 @@ class DesktopPet(QMainWindow):
                 else:
                     self.runcat_icons.append(QIcon(os.path.join(IMG_DIR, "idle.png")))
 
-        # 初始化 GPU (pynvml)
-        if HAS_PYNVML:
-            try:
-                pynvml.nvmlInit()
-                # 获取第0号 GPU
-                self.gpu_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                self.has_gpu = True
-            except Exception as e:
-                print(f"GPU Init Failed: {e}")
-                self.has_gpu = False
-
-        # 启动数据采样定时器 (1秒1次)
+        # 初始化 GPU (pynvml)，nvmlInit 进程级只跑一次，句柄挂在类上共享
+        DesktopPet.gpu_handle = _ensure_nvml()
+        self.has_gpu = DesktopPet.gpu_handle is not None
+
+        # GPU 查询失败后的指数退避 (30s 起，最长 10 分钟)
+        self._gpu_fail_until = 0
+        self._gpu_backoff = 30
+
+        # 采样放到后台守护线程，psutil/pynvml 的耗时不再打进 GUI 事件循环
+        self._latest = dict(self._usage)
+        self._usage_lock = threading.Lock()
+        sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        sampler.start()
+
+        # 定时器只负责把后台线程准备好的数值刷到托盘
         self.monitor_timer = QTimer(self)
         self.monitor_timer.timeout.connect(self.update_monitor_data)
-        self.monitor_timer.start(1000)
+        self.monitor_timer.start(MONITOR_INTERVAL_MS)
+
+        # RunCat 动画用一个常驻定时器驱动，间隔随负载调整，
+        # 避免每帧 singleShot 都新建一个 QTimer 对象
+        self._runcat_timer = QTimer(self)
+        self._runcat_timer.timeout.connect(self._runcat_step)
 
     def set_monitor_mode(self, mode):
         self.monitor_mode = mode
-        # 立即更新一次数据
+        # 切换模式后立即为新指标采样一次
         self.update_monitor_data()
 
     # --- [核心] 检测函数 ---
@@ -278,89 +405,104 @@ class DesktopPet(QMainWindow):
     def get_gpu_usage(self):
         if not self.has_gpu or not self.gpu_handle:
             return 0.0
+        if time.monotonic() < self._gpu_fail_until:
+            return 0.0
         try:
             # 获取显存使用率 (RunCat 通常逻辑)
             mem_info = pynvml.nvmlDeviceGetMemoryInfo(self.gpu_handle)
-            usage = mem_info.used / mem_info.total
-            return usage
+            self._gpu_backoff = 30
+            return mem_info.used / mem_info.total
             # 如果你想用 GPU 计算利用率，可以用这个替代：
             # rates = pynvml.nvmlDeviceGetUtilizationRates(self.gpu_handle)
             # return rates.gpu / 100.0
         except:
+            # 查询失败则指数退避，避免每个周期都去敲驱动
+            self._gpu_fail_until = time.monotonic() + self._gpu_backoff
+            self._gpu_backoff = min(self._gpu_backoff * 2, 600)
             return 0.0
 
+    def _sample_loop(self):
+        """后台线程循环：阻塞式 CPU 采样定节奏，只采当前选中的指标"""
+        while True:
+            usage = dict(self._latest)
+            usage["cpu"] = psutil.cpu_percent(interval=1.0) / 100.0
+            mode = self.monitor_mode
+            if mode == "mem":
+                usage["mem"] = self.get_mem_usage()
+            elif mode == "gpu":
+                usage["gpu"] = self.get_gpu_usage()
+            with self._usage_lock:
+                self._latest = usage
+
     def update_monitor_data(self):
-        """根据当前模式获取对应数据"""
-        val = 0.0
-        label = "Unknown"
-
-        if self.monitor_mode == "cpu":
-            val = self.get_cpu_usage()
-            label = "CPU"
-        elif self.monitor_mode == "mem":
-            val = self.get_mem_usage()
-            label = "Memory"
-        elif self.monitor_mode == "gpu":
-            val = self.get_gpu_usage()
-            label = "GPU"
-
-        self.current_usage = val
+        """显示刷新：只读后台线程准备好的数值，无任何系统调用"""
+        with self._usage_lock:
+            self._usage = self._latest
+        self._refresh_tooltip()
+
+    def _refresh_tooltip(self):
+        labels = {"cpu": "CPU", "mem": "Memory", "gpu": "GPU"}
+        self.current_usage = self._usage.get(self.monitor_mode, 0.0)
         if hasattr(self, 'tray'):
+            label = labels.get(self.monitor_mode, "Unknown")
             self.tray.setToolTip(f"{label}: {self.current_usage:.1%}")
 
-    def update_runcat_icon(self):
+    def _runcat_step(self):
         """动画刷新循环"""
         if not hasattr(self, 'tray') or not self.runcat_icons:
             return
 
         # 切换图标
-        current_icon = self.runcat_icons[self.runcat_frame_index]
-        self.tray.setIcon(current_icon)
+        self.tray.setIcon(self.runcat_icons[self.runcat_frame_index])
         self.runcat_frame_index = (self.runcat_frame_index + 1) % len(self.runcat_icons)
 
-        # 根据当前使用率计算延迟
-        # usage: 0.0 ~ 1.0
-        # 延迟: 200ms (空闲) ~ 20ms (满载)
-        delay_sec = 0.2 - (self.current_usage * 0.18)
-        delay_ms = int(delay_sec * 1000)
-        if delay_ms < 20: delay_ms = 20
-
-        QTimer.singleShot(delay_ms, self.update_runcat_icon)
+        # 根据当前使用率调整间隔: 200ms (空闲) ~ 20ms (满载)
+        self._runcat_timer.setInterval(max(20, int(200 - self.current_usage * 180)))
 
     # ==========================================
     # 4. 核心循环 Update (未改动)
     # ==========================================
     def update_tick(self):
+        # 固定 + 静止状态的快速路径：只推进动画，屏幕查询/物理/move 全部跳过
+        if self.is_fixed and self.state in _RESTING_STATES and not self.is_dragging:
+            self.update_animation_frame()
+            return
+
         self.update_screen_info()
         self.update_animation_frame()
 
         if self.is_dragging:
             return
 
-        # 3. 物理逻辑
-        if self.is_fixed and self.state not in ["drag_throw", "fly", "drop"]:
+        # 3. 物理逻辑 (set_state 已缓存位掩码与处理函数)
+        m = self._mask
+        if self.is_fixed and not (m & _MASK_AIR):
             pass
-        else:
-            if self.state in ["born", "sit", "sitloop", "sit_idle", "standup", "struggle"]:
-                self.vx = 0
-                self.vy = 0
-            elif self.state in ["fly", "drop", "drag_throw"]:
-                self.update_physics_air()
-            elif self.state in ["wall_idle", "wall_climb", "wall_descend"]:
-                self.update_physics_wall()
-            elif self.state == "ceiling_walk":
-                self.update_physics_ceiling()
-            elif self.state in ["idle", "walk", "run", "ie_walk"]:
-                self.update_physics_floor()
-
-        # 4. 移动窗口
-        if self.is_fixed and self.state not in ["fly", "drop", "drag_throw"]:
+        elif m & _MASK_STATIC:
+            self.vx = 0
+            self.vy = 0
+        elif self._phys is not None:
+            self._phys(self)
+
+        # 4. 移动窗口 (物理可能切换了状态，重读掩码)
+        if self.is_fixed and not (self._mask & _MASK_AIR):
             pass
         else:
+            self._apply_geometry()
+
+    def _apply_geometry(self):
+        """move + resize 融合成一次 setGeometry，几何没变就不发窗口消息"""
+        pix = self.pixmap
+        if pix is None:
             self.move(int(self.x), int(self.y))
+            return
+        geom = (int(self.x), int(self.y), pix.width(), pix.height())
+        if geom != self._last_geom:
+            self._last_geom = geom
+            self.setGeometry(*geom)
 
     def update_screen_info(self, force_update=False):
-        if not force_update and self.state in ["wall_climb", "wall_descend", "wall_idle", "ceiling_walk"]:
+        if not force_update and self.state in _NO_SCREEN_UPDATE_STATES:
             return
 
         pet_center = QPoint(int(self.x + 64), int(self.y + 64))
@@ -368,20 +510,22 @@ class DesktopPet(QMainWindow):
         if screen_num == -1:
             screen_num = self.desktop.primaryScreen()
 
-        rect = self.desktop.availableGeometry(screen_num)
+        rect = manager.get_geom(screen_num)
         if force_update or getattr(self, 'screen_rect', None) != rect:
             self.screen_rect = rect
 
     def update_animation_frame(self):
-        frames = ACTIONS.get(self.state, ACTIONS["idle"])
-        if self.frame_index >= len(frames): self.frame_index = 0
-        current_frame = frames[self.frame_index]
-
-        self.frame_timer += 30
-        if self.frame_timer >= current_frame["dur"]:
+        durs = ACTIONS_DUR.get(self.state, ACTIONS_DUR["idle"])
+        if self.frame_index >= len(durs): self.frame_index = 0
+
+        # 按真实流逝时间推进，定时器抖动/卡顿时直接跳帧而不是慢放
+        now = time.monotonic_ns()
+        self.frame_timer += (now - self._last_tick_ns) // 1_000_000
+        self._last_tick_ns = now
+        if self.frame_timer >= durs[self.frame_index]:
             self.frame_timer = 0
             self.frame_index += 1
-            if self.frame_index >= len(frames):
+            if self.frame_index >= len(durs):
                 self.frame_index = 0
                 self.on_action_finished()
         self.update_image()
@@ -404,7 +548,7 @@ class DesktopPet(QMainWindow):
                 self.set_state("standup")
         elif self.state == "standup":
             self.set_state("idle")
-        elif self.state in ["idle", "walk", "run", "ie_walk"]:
+        elif self.state in _FLOOR_STATES:
             self.decide_ai()
 
     # ==========================================
@@ -520,9 +664,7 @@ class DesktopPet(QMainWindow):
                 elif self.wander_mode in ["ceiling", "full"]:
                     self.to_ceiling(left_bound, right_bound)
                 else:
-                    weights = [20, 30, 30, 20]
-                    options = ["idle", "descend", "ceiling", "jump"]
-                    choice = random.choices(options, weights=weights)[0]
+                    choice = _WALL_TOP_OPTS[bisect.bisect_left(_WALL_TOP_CUM, random.random() * 100)]
 
                     if choice == "idle":
                         self.set_state("wall_idle")
@@ -612,7 +754,7 @@ class DesktopPet(QMainWindow):
                 self.vy = 0
 
     def update_physics_floor(self):
-        if self.state in ["walk", "run", "ie_walk"]:
+        if self.state in _FLOOR_MOVE_STATES:
             speed = 2
             if self.state == "run": speed = 5
             if self.is_fixed: speed = 0
@@ -645,6 +787,8 @@ class DesktopPet(QMainWindow):
         if self.state == new_state: return
         if new_state == "ceiling_walk": self.ceiling_dist = 0
         self.state = new_state
+        self._mask = _STATE_MASK.get(new_state, 0)
+        self._phys = _STATE_HANDLERS.get(new_state)
         self.frame_index = 0
         self.frame_timer = 0
         self.update_image()
@@ -681,26 +825,20 @@ class DesktopPet(QMainWindow):
         manager.add_pet(new_pet)
 
     def update_image(self):
-        conf = ACTIONS.get(self.state)
-        if not conf:
-            conf = ACTIONS["idle"]
-
-        if self.frame_index >= len(conf): self.frame_index = 0
-        current_frame = conf[self.frame_index]
-        img_name = current_frame["img"]
-
-        key = img_name
-        if self.look_right: key += "_r"
+        frames = self._frame_table.get(self.state)
+        if not frames:
+            frames = self._frame_table.get("idle")
+            if not frames: return
 
-        if key in self.img_cache:
-            self.pixmap = self.img_cache[key]
-            self.resize(self.pixmap.size())
-            self.update()
+        if self.frame_index >= len(frames): self.frame_index = 0
+        pix = frames[self.frame_index][self.look_right]
 
-    def paintEvent(self, event):
-        if hasattr(self, 'pixmap'):
-            painter = QPainter(self)
-            painter.drawPixmap(0, 0, self.pixmap)
+        # 同一张图就不必重新触发几何调整/重绘
+        if pix is self.pixmap: return
+        self.pixmap = pix
+        self._label.setPixmap(pix)
+        self._label.resize(pix.size())
+        self._apply_geometry()
 
     # ==========================================
     # 8. 鼠标交互
@@ -708,7 +846,7 @@ class DesktopPet(QMainWindow):
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.is_dragging = True
-            self.mouse_history = []
+            self.mouse_history.clear()
             self.drag_offset = event.globalPos() - self.frameGeometry().topLeft()
             self.last_drag_x = event.globalPos().x()
             self.raise_()
@@ -739,10 +877,9 @@ class DesktopPet(QMainWindow):
 
             self.x = new_pos.x()
             self.y = new_pos.y()
-            self.move(int(self.x), int(self.y))
+            self._apply_geometry()
 
             self.mouse_history.append(g_pos)
-            if len(self.mouse_history) > 6: self.mouse_history.pop(0)
             event.accept()
 
     def mouseReleaseEvent(self, event):
@@ -849,6 +986,15 @@ class DesktopPet(QMainWindow):
         manager.remove_pet(self)
         if len(manager.pets) == 0:
             QApplication.quit()
+        else:
+            manager.sort_windows()
+
+
+# 填充物理分发表 (需要等类定义完成)
+_STATE_HANDLERS.update({s: DesktopPet.update_physics_air for s in _AIR_STATES})
+_STATE_HANDLERS.update({s: DesktopPet.update_physics_wall for s in _WALL_STATES})
+_STATE_HANDLERS["ceiling_walk"] = DesktopPet.update_physics_ceiling
+_STATE_HANDLERS.update({s: DesktopPet.update_physics_floor for s in _FLOOR_STATES})
 
 
 if __name__ == "__main__":
@@ -856,8 +1002,6 @@ if __name__ == "__main__":
     pet = DesktopPet(start_state="drop")
     manager.add_pet(pet)
 
-    z_order_timer = QTimer()
-    z_order_timer.timeout.connect(manager.sort_windows)
-    z_order_timer.start(500)
-
+    # 层级调整由事件驱动 (add_pet / close_pet / 鼠标按下)，
+    # 不再用 500ms 定时器盲目轮询 raise_()
     sys.exit(app.exec_())
\ No newline at end of file
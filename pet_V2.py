@@ -1,5 +1,7 @@
 import sys
 import os
+import mmap
+import struct
 import random
 import psutil
 
@@ -11,9 +13,19 @@ try:
 except ImportError:
     HAS_PYNVML = False
 
+# 尝试导入 numpy 用于批量物理积分
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from concurrent.futures import ThreadPoolExecutor
+
 from PyQt5.QtWidgets import QApplication, QMainWindow, QMenu, QAction, QSystemTrayIcon, QActionGroup
-from PyQt5.QtCore import QTimer, Qt, QPoint
-from PyQt5.QtGui import QPixmap, QPainter, QTransform, QIcon
+from PyQt5.QtCore import QTimer, Qt, QPoint, QRect
+from PyQt5.QtGui import QPixmap, QPainter, QIcon, QImage
 
 def resource_path(relative_path):
     """ 获取资源的绝对路径，适配开发环境和打包后的环境 """
@@ -41,6 +53,11 @@ MAX_PETS = 5
 FLOOR_OFFSET = 50
 RIGHT_WALL_OFFSET = 55
 
+# 解码后的帧像素持久化缓存 (原始 ARGB32)，避免每次启动重复解 PNG
+BLOB_PATH = IMG_DIR + "_cache.bin"
+BLOB_MAGIC = b"PETB"
+BLOB_VERSION = 1
+
 ACTIONS = {
     # --- 分身 ---
     "born": [{"img": f"born{i:05d}.png", "dur": 300} for i in range(6)],
@@ -78,6 +95,26 @@ ACTIONS = {
     "struggle": [{"img": f"struggle{i:05d}.png", "dur": 120} for i in range(3)],
 }
 
+# 帧配置在导入时压成 (文件名, 时长) 元组：
+# 热路径上按位置索引取值，比每 tick 两次字典查找快
+ACTIONS = {k: tuple((d["img"], d["dur"]) for d in v) for k, v in ACTIONS.items()}
+
+# 各动作之间大量复用同一批帧文件 (如 run 复用 walk 的图)，
+# 去重后的文件名集合在导入时算好，加载时直接作为工作队列
+UNIQUE_FRAMES = frozenset(img for frames in ACTIONS.values() for img, _ in frames)
+
+# 状态分组常量：O(1) 哈希判成员，避免热路径上每次新建列表线性扫描
+STATIC_STATES = frozenset({"born", "sit", "sitloop", "sit_idle", "standup", "struggle"})
+AIR_STATES = frozenset({"fly", "drop", "drag_throw"})
+WALL_STATES = frozenset({"wall_idle", "wall_climb", "wall_descend"})
+FLOOR_STATES = frozenset({"idle", "walk", "run", "ie_walk"})
+NO_SCREEN_UPDATE = frozenset({"wall_climb", "wall_descend", "wall_idle", "ceiling_walk"})
+
+# 水平速度符号 → (状态, 朝向) 查表：
+# sign 由比较算式 (v > 2) - (v < -2) 求得，热路径上不再走阈值分支链
+AIR_STATE_BY_SIGN = {-1: ("fly", False), 0: ("drop", None), 1: ("drag_throw", True)}
+DRAG_STATE_BY_SIGN = {-1: ("drag_left_fast", False), 1: ("drag_right_fast", True)}
+
 
 # ==========================================
 # 2. 资源单例 (SharedAssets)
@@ -100,42 +137,159 @@ class SharedAssets:
         self.img_cache = {}
         self.runcat_icons = []
 
-        # 1. 加载宠物动作图片
+        # 1. 加载宠物动作图片：优先走原始像素缓存，没有或过期再解 PNG
         if os.path.exists(IMG_DIR):
-            transform = QTransform().scale(-1, 1)  # 用于生成镜像图片
-
-            # 预加载所有定义的图片
-            for frames_list in ACTIONS.values():
-                for frame_data in frames_list:
-                    name = frame_data["img"]
-                    if name in self.img_cache: continue
-
-                    path = os.path.join(IMG_DIR, name)
-                    pix = QPixmap(path)
-                    if pix.isNull():
-                        pix = QPixmap(128, 128)
-                        pix.fill(Qt.transparent)
-
-                    self.img_cache[name] = pix
-                    self.img_cache[name + "_r"] = pix.transformed(transform)
-
-        # 2. 加载 RunCat 图标
+            if not self._load_from_blob(BLOB_PATH):
+                self._decode_from_png()
+                self._save_blob(BLOB_PATH)
+
+        # 2. 按状态打包纹理图集：一个状态一张 QPixmap，绘制时取子矩形
+        self.atlas = {}
+        if self.img_cache:
+            self._build_atlases()
+
+        # 3. 加载 RunCat 图标：帧图同样丢线程池先解码成 QImage (可重入)，
+        #    QIcon(路径) 的惰性解码就不会落在第一次托盘绘制时；
+        #    兜底图标只构造一次，循环内复用
         if os.path.exists(RUNCAT_DIR):
-            for i in range(10):
-                p = os.path.join(RUNCAT_DIR, f"{i}.png")
-                if os.path.exists(p):
-                    self.runcat_icons.append(QIcon(p))
+            paths = [os.path.join(RUNCAT_DIR, f"{i}.png") for i in range(10)]
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                images = list(pool.map(QImage, paths))
+
+            fallback_icon = None
+            for img in images:
+                if not img.isNull():
+                    self.runcat_icons.append(QIcon(QPixmap.fromImage(img)))
                 else:
-                    fallback = self.get_pixmap("idle.png")
-                    if fallback:
-                        self.runcat_icons.append(QIcon(fallback))
+                    if fallback_icon is None:
+                        fb = self.get_pixmap("idle.png")
+                        if fb: fallback_icon = QIcon(fb)
+                    if fallback_icon:
+                        self.runcat_icons.append(fallback_icon)
 
         self.initialized = True
         # print("所有资源加载完成。")
 
+    def _decode_from_png(self):
+        names = list(UNIQUE_FRAMES)
+
+        # PNG 解码可重入且会释放 GIL，放进线程池并行跑；
+        # QPixmap 只能在 GUI 线程创建，转换和镜像留在主线程
+        paths = [os.path.join(IMG_DIR, n) for n in names]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            images = list(pool.map(QImage, paths))
+
+        for name, img in zip(names, images):
+            if img.isNull():
+                pix = QPixmap(128, 128)
+                pix.fill(Qt.transparent)
+                self.img_cache[name] = pix
+                self.img_cache[name + "_r"] = pix
+            else:
+                self.img_cache[name] = QPixmap.fromImage(img)
+                # 镜像帧在构建缓存时一并生成，随 blob 落盘后
+                # 后续启动的翻转开销为零
+                self.img_cache[name + "_r"] = QPixmap.fromImage(img.mirrored(True, False))
+
+    def _build_atlases(self):
+        """把每个状态的帧横向打包成一张图集 (两种朝向各一张)。
+        paintEvent 对同一图集做子矩形绘制：QPixmap 句柄大幅减少，
+        同图集的绘制提交也更容易被绘制引擎合并。"""
+        for state, frames in ACTIONS.items():
+            for look_right in (False, True):
+                pixes = [self.get_pixmap(img, look_right) for img, _ in frames]
+                pixes = [p for p in pixes if p is not None]
+                if not pixes:
+                    continue
+                cw = max(p.width() for p in pixes)
+                ch = max(p.height() for p in pixes)
+                atlas = QPixmap(cw * len(pixes), ch)
+                atlas.fill(Qt.transparent)
+                painter = QPainter(atlas)
+                for i, p in enumerate(pixes):
+                    painter.drawPixmap(i * cw, 0, p)
+                painter.end()
+                self.atlas[(state, look_right)] = (atlas, len(pixes), cw, ch)
+
+    def get_atlas(self, state, look_right=False):
+        entry = self.atlas.get((state, look_right))
+        if entry is None:
+            entry = self.atlas.get(("idle", look_right))
+        return entry
+
+    def _source_mtime(self):
+        """图片目录里最新一张 PNG 的修改时间，作为缓存是否过期的依据"""
+        try:
+            return max(e.stat().st_mtime for e in os.scandir(IMG_DIR)
+                       if e.name.lower().endswith(".png"))
+        except (OSError, ValueError):
+            return 0.0
+
+    def _load_from_blob(self, path):
+        """从持久化缓存 mmap 读取原始 ARGB32 像素，跳过 libpng 解码"""
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    magic, version, mtime, count = struct.unpack_from("<4sIdI", mm, 0)
+                    if magic != BLOB_MAGIC or version != BLOB_VERSION:
+                        return False
+                    if mtime != self._source_mtime():
+                        return False  # 源图片有更新，缓存作废
+
+                    off = struct.calcsize("<4sIdI")
+                    for _ in range(count):
+                        (nlen,) = struct.unpack_from("<H", mm, off); off += 2
+                        name = mm[off:off + nlen].decode("utf-8"); off += nlen
+                        w, h = struct.unpack_from("<II", mm, off); off += 8
+                        size = w * h * 4
+                        img = QImage(mm[off:off + size], w, h, QImage.Format_ARGB32)
+                        off += size
+                        self.img_cache[name] = QPixmap.fromImage(img)
+                finally:
+                    mm.close()
+            return bool(self.img_cache)
+        except Exception as e:
+            print(f"读取帧缓存失败，改走 PNG 解码: {e}")
+            self.img_cache = {}
+            return False
+
+    def _save_blob(self, path):
+        """把解码好的帧按 {文件头, 名称, 宽高, 原始像素} 的格式写盘"""
+        if not self.img_cache:
+            return
+        try:
+            with open(path, "wb") as f:
+                f.write(struct.pack("<4sIdI", BLOB_MAGIC, BLOB_VERSION,
+                                    self._source_mtime(), len(self.img_cache)))
+                for name, pix in self.img_cache.items():
+                    img = pix.toImage().convertToFormat(QImage.Format_ARGB32)
+                    raw = img.bits()
+                    raw.setsize(img.byteCount())
+                    nb = name.encode("utf-8")
+                    f.write(struct.pack("<H", len(nb)) + nb)
+                    f.write(struct.pack("<II", img.width(), img.height()))
+                    f.write(bytes(raw))
+        except Exception as e:
+            print(f"写入帧缓存失败: {e}")
+
     def get_pixmap(self, name, look_right=False):
-        key = name + "_r" if look_right else name
-        return self.img_cache.get(key)
+        if not look_right:
+            return self.img_cache.get(name)
+
+        # 镜像帧正常在构建缓存时就已生成 (见 _decode_from_png)；
+        # 这里的按需生成只作为缓存缺项时的兜底
+        key = name + "_r"
+        pix = self.img_cache.get(key)
+        if pix is None:
+            base = self.img_cache.get(name)
+            if base is None:
+                return None
+            pix = QPixmap.fromImage(base.toImage().mirrored(True, False))
+            self.img_cache[key] = pix
+        return pix
 
 
 # ==========================================
@@ -156,6 +310,7 @@ class PetManager(QSystemTrayIcon):
         # --- 硬件监控初始化 ---
         self.monitor_mode = "cpu"
         self.current_usage = 0.0
+        self._prev_cpu_times = psutil.cpu_times()  # 用于 idle/total 差值法算 CPU 占用
         self.runcat_frame_index = 0
         self.has_gpu = False
         self.gpu_handle = None
@@ -177,13 +332,49 @@ class PetManager(QSystemTrayIcon):
         self.monitor_timer.timeout.connect(self.update_monitor_data)
         self.monitor_timer.start(1000)
 
-        # 2. 窗口层级排序定时器 (500ms1次)
-        self.sort_timer = QTimer(self)
-        self.sort_timer.timeout.connect(self.sort_windows)
-        self.sort_timer.start(500)
+        # 2. 宠物共享 tick：所有宠物由这一个 30ms 定时器驱动，
+        #    层级排序按 1/16 的频率 (约500ms) 折叠进同一个回调
+        self._tick_count = 0
+        self.tick_timer = QTimer(self)
+        self.tick_timer.timeout.connect(self._tick_all)
+        self.tick_timer.start(30)
+
+        # 3. RunCat 动画：常驻定时器驱动，间隔只在占用率变化时调整
+        #    (替代原来每帧 singleShot 重建定时器的做法)
+        self.runcat_timer = QTimer(self)
+        self.runcat_timer.timeout.connect(self.update_runcat_icon)
+        self.runcat_timer.start(200)
+
+    def _tick_all(self):
+        pets = list(self.pets)
+        if HAS_NUMPY and len(pets) > 1:
+            self._integrate_air(pets)
+        for pet in pets:
+            pet.update_tick()
+        self._tick_count += 1
+        if self._tick_count & 15 == 0:
+            self.sort_windows()
+
+    def _integrate_air(self, pets):
+        """空中状态的重力积分对所有宠物是同一组算式，
+        先在 NumPy 数组里一次算完再写回各实例 (SoA 批处理)；
+        边界/落地判定仍由各自的 update_physics_air 处理。"""
+        air = [p for p in pets
+               if not p.is_dragging and p.state in AIR_STATES]
+        if not air:
+            return
+
+        vx = np.array([p.vx for p in air], np.float32)
+        vy = np.array([p.vy for p in air], np.float32)
+        px = np.array([p.x for p in air], np.float32) + vx
+        py = np.array([p.y for p in air], np.float32) + vy
+        vy += np.array([p.gravity for p in air], np.float32)
+        vx *= 0.98
 
-        # 3. 启动 RunCat 动画
-        self.update_runcat_icon()
+        for i, p in enumerate(air):
+            p.x = float(px[i]); p.y = float(py[i])
+            p.vx = float(vx[i]); p.vy = float(vy[i])
+            p._integrated = True
 
     def init_tray_ui(self):
         # 设置默认图标
@@ -281,7 +472,14 @@ class PetManager(QSystemTrayIcon):
 
     def update_monitor_data(self):
         if self.monitor_mode == "cpu":
-            self.current_usage = psutil.cpu_percent(interval=None) / 100.0
+            # 直接拿 cpu_times 的 idle/total 差值算占用率，
+            # 绕开 cpu_percent 内部的状态维护和额外分配
+            t = psutil.cpu_times()
+            idle_d = t.idle - self._prev_cpu_times.idle
+            total_d = sum(t) - sum(self._prev_cpu_times)
+            self._prev_cpu_times = t
+            if total_d > 0:
+                self.current_usage = max(0.0, 1.0 - idle_d / total_d)
             label = "CPU"
         elif self.monitor_mode == "mem":
             self.current_usage = psutil.virtual_memory().percent / 100.0
@@ -300,6 +498,11 @@ class PetManager(QSystemTrayIcon):
 
         self.setToolTip(f"{label}: {self.current_usage:.1%}")
 
+        # 占用率越高猫跑得越快；间隔没变就不动定时器
+        delay_ms = max(20, int(200 - self.current_usage * 180))
+        if delay_ms != self.runcat_timer.interval():
+            self.runcat_timer.setInterval(delay_ms)
+
     def update_runcat_icon(self):
         icons = self.assets.runcat_icons
         if not icons: return
@@ -307,13 +510,6 @@ class PetManager(QSystemTrayIcon):
         self.setIcon(icons[self.runcat_frame_index])
         self.runcat_frame_index = (self.runcat_frame_index + 1) % len(icons)
 
-        # 延迟算法
-        delay_sec = 0.2 - (self.current_usage * 0.18)
-        delay_ms = int(delay_sec * 1000)
-        if delay_ms < 20: delay_ms = 20
-
-        QTimer.singleShot(delay_ms, self.update_runcat_icon)
-
 
 # ==========================================
 # 4. 桌面宠物类 (轻量化)
@@ -346,29 +542,36 @@ class DesktopPet(QMainWindow):
         self.vx = 0
         self.vy = 0
         self.gravity = 2
+        self._integrated = False  # 本 tick 的积分是否已由 manager 批量完成
 
         # 开关
         self.is_fixed = False
         self.wander_mode = None
 
-        # 动画
+        # 动画 (帧配置在状态切换时缓存，tick 里不再查 ACTIONS)
         self.frame_index = 0
         self.frame_timer = 0
+        self._frames = ACTIONS.get(start_state, ACTIONS["idle"])
+        self._frame_count = len(self._frames)
+        self._current_frame = self._frames[0]
+        self._last_frame_drawn = -1
+        self._frame_cells = 1
+        self._cell_w = self._cell_h = 128
+        self.pixmap = None  # 构造期给默认值，paintEvent 不再用昂贵的 hasattr 探测
 
         # 交互
         self.is_dragging = False
         self.mouse_history = []
         self.drag_offset = QPoint(0, 0)
         self.last_drag_x = 0
+        self._last_dx_sign = 0
         self.ceiling_dist = 0
 
-        # --- 定时器 ---
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_tick)
-        self.timer.start(30)
+        # 核心循环由 manager 的共享定时器驱动 (见 PetManager._tick_all)
 
         self.update_image()
-        self.move(int(self.x), int(self.y))
+        self._last_move = (int(self.x), int(self.y))
+        self.move(*self._last_move)
         self.show()
 
     def update_tick(self):
@@ -379,56 +582,70 @@ class DesktopPet(QMainWindow):
             return
 
         # 物理逻辑
-        if self.is_fixed and self.state not in ["drag_throw", "fly", "drop"]:
+        if self.is_fixed and self.state not in AIR_STATES:
             pass
         else:
-            if self.state in ["born", "sit", "sitloop", "sit_idle", "standup", "struggle"]:
+            if self.state in STATIC_STATES:
                 self.vx = 0
                 self.vy = 0
-            elif self.state in ["fly", "drop", "drag_throw"]:
+            elif self.state in AIR_STATES:
                 self.update_physics_air()
-            elif self.state in ["wall_idle", "wall_climb", "wall_descend"]:
+            elif self.state in WALL_STATES:
                 self.update_physics_wall()
             elif self.state == "ceiling_walk":
                 self.update_physics_ceiling()
-            elif self.state in ["idle", "walk", "run", "ie_walk"]:
+            elif self.state in FLOOR_STATES:
                 self.update_physics_floor()
 
-        # 移动窗口
-        if self.is_fixed and self.state not in ["fly", "drop", "drag_throw"]:
+        # 移动窗口：整数坐标没变就不动窗口，静止状态下省掉
+        # 每 tick 一次的窗口管理器调用 (SetWindowPos 等)
+        if self.is_fixed and self.state not in AIR_STATES:
             pass
         else:
-            self.move(int(self.x), int(self.y))
+            mxy = (int(self.x), int(self.y))
+            if mxy != self._last_move:
+                self.move(*mxy)
+                self._last_move = mxy
 
     def update_image(self):
-        conf = ACTIONS.get(self.state, ACTIONS["idle"])
-        if self.frame_index >= len(conf): self.frame_index = 0
-
-        img_name = conf[self.frame_index]["img"]
-        pix = self.assets.get_pixmap(img_name, self.look_right)
-
-        if pix:
-            self.pixmap = pix
-            self.resize(pix.size())
+        entry = self.assets.get_atlas(self.state, self.look_right)
+        if entry is None:
+            return
+        atlas, count, cw, ch = entry
+
+        if atlas is not self.pixmap:
+            # 状态或朝向变了：换图集并按单元格尺寸调整窗口
+            self.pixmap = atlas
+            self._frame_cells = count
+            self._cell_w, self._cell_h = cw, ch
+            if self.width() != cw or self.height() != ch:
+                self.resize(cw, ch)
+            self.update()
+        elif self.frame_index != self._last_frame_drawn:
+            # 同一图集内只有帧序号前进时才请求重绘
             self.update()
+        self._last_frame_drawn = self.frame_index
 
     def paintEvent(self, event):
-        if hasattr(self, 'pixmap'):
-            painter = QPainter(self)
-            painter.drawPixmap(0, 0, self.pixmap)
+        if self.pixmap is None:
+            return
+        idx = self.frame_index
+        if idx >= self._frame_cells: idx = 0
+        painter = QPainter(self)
+        painter.drawPixmap(QRect(0, 0, self._cell_w, self._cell_h), self.pixmap,
+                           QRect(idx * self._cell_w, 0, self._cell_w, self._cell_h))
 
     def update_animation_frame(self):
-        conf = ACTIONS.get(self.state, ACTIONS["idle"])
-        current_frame = conf[self.frame_index]
-
         self.frame_timer += 30
-        if self.frame_timer >= current_frame["dur"]:
+        if self.frame_timer >= self._current_frame[1]:
             self.frame_timer = 0
             self.frame_index = (self.frame_index + 1)
 
-            if self.frame_index >= len(conf):
+            if self.frame_index >= self._frame_count:
                 self.frame_index = 0
                 self.on_action_finished()
+            # on_action_finished 可能已切换状态，按最新配置取当前帧
+            self._current_frame = self._frames[self.frame_index]
         self.update_image()
 
     def on_action_finished(self):
@@ -453,7 +670,7 @@ class DesktopPet(QMainWindow):
                 self.set_state("standup")
         elif self.state == "standup":
             self.set_state("idle")
-        elif self.state in ["idle", "walk", "run", "ie_walk"]:
+        elif self.state in FLOOR_STATES:
             self.decide_ai()
 
     def decide_ai(self):
@@ -478,23 +695,23 @@ class DesktopPet(QMainWindow):
         if self.state == new_state: return
         if new_state == "ceiling_walk": self.ceiling_dist = 0
         self.state = new_state
+        self._frames = ACTIONS.get(new_state, ACTIONS["idle"])
+        self._frame_count = len(self._frames)
+        self._current_frame = self._frames[0]
         self.frame_index = 0
         self.frame_timer = 0
         self.update_image()
 
     # --- 辅助方法 (用于菜单逻辑) ---
     def snap_to_nearest_wall(self):
-        left_wall_x = self.screen_rect.left()
-        right_wall_x = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
-
-        dist_left = abs(self.x - left_wall_x)
-        dist_right = abs(self.x - right_wall_x)
+        dist_left = abs(self.x - self._left)
+        dist_right = abs(self.x - self._right)
 
         if dist_left < dist_right:
-            self.x = left_wall_x
+            self.x = self._left
             self.look_right = False
         else:
-            self.x = right_wall_x
+            self.x = self._right
             self.look_right = True
 
     def start_wall_wander(self):
@@ -505,13 +722,26 @@ class DesktopPet(QMainWindow):
 
     # --- 物理逻辑 ---
     def update_screen_info(self, force_update=False):
-        if not force_update and self.state in ["wall_climb", "wall_descend", "wall_idle", "ceiling_walk"]:
+        if not force_update and self.state in NO_SCREEN_UPDATE:
             return
         pet_center = QPoint(int(self.x + 64), int(self.y + 64))
+
+        # 快速路径：宠物每 tick 只挪几个像素，绝大多数时候还在上次的屏幕里，
+        # 直接用缓存矩形判含，免去对平台插件的屏幕号查询
+        cached = getattr(self, 'screen_rect', None)
+        if not force_update and cached is not None and cached.contains(pet_center):
+            return
+
         screen_num = self.desktop.screenNumber(pet_center)
         rect = self.desktop.availableGeometry(screen_num)
         if force_update or getattr(self, 'screen_rect', None) != rect:
             self.screen_rect = rect
+            # 由屏幕矩形派生的各条边界只在换屏时重算一次，物理循环直接取用
+            self._left = rect.left()
+            self._right = rect.right() - 128 - RIGHT_WALL_OFFSET
+            self._floor_y = rect.bottom() - 128 - FLOOR_OFFSET
+            self._top = rect.top()
+            self._bottom = rect.bottom() - 80
 
     def respawn_at_top(self):
         self.x = self.screen_rect.center().x() - 64
@@ -521,31 +751,32 @@ class DesktopPet(QMainWindow):
         self.set_state("drop")
 
     def update_physics_air(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        self.vx *= 0.98
-
-        if self.vx < -2:
-            if self.state != "fly": self.set_state("fly"); self.look_right = False
-        elif self.vx > 2:
-            if self.state != "drag_throw": self.set_state("drag_throw"); self.look_right = True
+        if self._integrated:
+            self._integrated = False
         else:
-            if self.state not in ["drop"]: self.set_state("drop")
-
-        if self.y > self.screen_rect.bottom() - 80:
+            self.x += self.vx
+            self.y += self.vy
+            self.vy += self.gravity
+            self.vx *= 0.98
+
+        sign = (self.vx > 2) - (self.vx < -2)
+        target, face_right = AIR_STATE_BY_SIGN[sign]
+        if self.state != target:
+            self.set_state(target)
+            if face_right is not None: self.look_right = face_right
+
+        if self.y > self._bottom:
             self.respawn_at_top()
             return
 
-        floor_y = self.screen_rect.bottom() - 128 - FLOOR_OFFSET
-        if self.y >= floor_y:
-            self.y = floor_y
+        if self.y >= self._floor_y:
+            self.y = self._floor_y
             self.vx = 0;
             self.vy = 0
             self.set_state("idle")
 
-        left = self.screen_rect.left()
-        right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+        left = self._left
+        right = self._right
         if self.x <= left:
             self.x = left;
             self.vx = 0;
@@ -560,8 +791,8 @@ class DesktopPet(QMainWindow):
             self.set_state("wall_idle")
 
     def update_physics_wall(self):
-        left = self.screen_rect.left()
-        right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+        left = self._left
+        right = self._right
 
         if self.x < left + 64:
             self.x = left; self.look_right = False
@@ -570,14 +801,13 @@ class DesktopPet(QMainWindow):
 
         if self.state == "wall_climb":
             if not self.is_fixed: self.y -= 5
-            if self.y <= self.screen_rect.top():
-                self.y = self.screen_rect.top()
+            if self.y <= self._top:
+                self.y = self._top
                 self.to_ceiling(left, right)
         elif self.state == "wall_descend":
             if not self.is_fixed: self.y += 5
-            floor_y = self.screen_rect.bottom() - 128 - FLOOR_OFFSET
-            if self.y >= floor_y:
-                self.y = floor_y
+            if self.y >= self._floor_y:
+                self.y = self._floor_y
                 self.set_state("idle")
         elif self.state == "wall_idle":
             if random.random() < 0.02: self.set_state("wall_climb")
@@ -590,7 +820,7 @@ class DesktopPet(QMainWindow):
             self.x = r - 5; self.look_right = False
 
     def update_physics_ceiling(self):
-        self.y = self.screen_rect.top()
+        self.y = self._top
         speed = 3
         if self.is_fixed: speed = 0
         self.x += speed if self.look_right else -speed
@@ -601,8 +831,8 @@ class DesktopPet(QMainWindow):
             self.vy = 0;
             return
 
-        left = self.screen_rect.left()
-        right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+        left = self._left
+        right = self._right
         if self.x <= left:
             self.x = left
             if self.wander_mode == "ceiling":
@@ -626,8 +856,8 @@ class DesktopPet(QMainWindow):
             if self.is_fixed: speed = 0
             self.x += speed if self.look_right else -speed
 
-            left = self.screen_rect.left()
-            right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+            left = self._left
+            right = self._right
             if self.x <= left:
                 self.x = left;
                 self.look_right = False
@@ -648,6 +878,7 @@ class DesktopPet(QMainWindow):
         if event.button() == Qt.LeftButton:
             self.is_dragging = True
             self.mouse_history = []
+            self._last_dx_sign = 0
             self.drag_offset = event.globalPos() - self.frameGeometry().topLeft()
             self.last_drag_x = event.globalPos().x()
             self.raise_()
@@ -662,14 +893,19 @@ class DesktopPet(QMainWindow):
             dx = curr_x - self.last_drag_x
             self.last_drag_x = curr_x
 
-            if dx < -2:
-                self.set_state("drag_left_fast"); self.look_right = False
-            elif dx > 2:
-                self.set_state("drag_right_fast"); self.look_right = True
+            # 鼠标事件最高可到上千 Hz，只在拖拽方向翻转的那一刻切状态，
+            # 避免同向移动的事件流反复重置动画帧
+            sign = (dx > 2) - (dx < -2)
+            if sign and sign != self._last_dx_sign:
+                target, face_right = DRAG_STATE_BY_SIGN[sign]
+                self.set_state(target)
+                self.look_right = face_right
+                self._last_dx_sign = sign
 
             self.x = new_pos.x()
             self.y = new_pos.y()
-            self.move(int(self.x), int(self.y))
+            self._last_move = (int(self.x), int(self.y))
+            self.move(*self._last_move)
 
             self.mouse_history.append(g_pos)
             if len(self.mouse_history) > 6: self.mouse_history.pop(0)
@@ -687,12 +923,10 @@ class DesktopPet(QMainWindow):
             self.vx = vx;
             self.vy = vy
 
-            if vx < -2:
-                self.set_state("fly"); self.look_right = False
-            elif vx > 2:
-                self.set_state("drag_throw"); self.look_right = True
-            else:
-                self.set_state("drop")
+            sign = (vx > 2) - (vx < -2)
+            target, face_right = AIR_STATE_BY_SIGN[sign]
+            self.set_state(target)
+            if face_right is not None: self.look_right = face_right
             event.accept()
 
     # --- 【修正】右键菜单逻辑 ---
@@ -1,8 +1,15 @@
 import sys
 import os
+import bisect
+import struct
+import hashlib
 import random
+import time
 import psutil
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 # Attempt to import pynvml for GPU monitoring
 try:
     import pynvml
@@ -11,9 +18,9 @@ try:
 except ImportError:
     HAS_PYNVML = False
 
-from PyQt5.QtWidgets import QApplication, QMainWindow, QMenu, QAction, QSystemTrayIcon, QActionGroup, QInputDialog
-from PyQt5.QtCore import QTimer, Qt, QPoint
-from PyQt5.QtGui import QPixmap, QPainter, QTransform, QIcon
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMenu, QAction, QSystemTrayIcon, QActionGroup, QInputDialog, QLabel
+from PyQt5.QtCore import QTimer, Qt, QPoint, QThread, QObject, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QPixmap, QPixmapCache, QIcon, QImage, QCursor
 
 def resource_path(relative_path):
     """ 获取资源的绝对路径，适配开发环境和打包后的环境 """
@@ -41,6 +48,15 @@ MAX_PETS = 5
 FLOOR_OFFSET = 50
 RIGHT_WALL_OFFSET = 55
 
+# Tick cadence in ms. Animation timing is wall-clock based, so this only
+# sets how often physics and painting get a chance to run (16 = 60 FPS,
+# 33 = 30 FPS); frames never play faster or slower because of it.
+TICK_INTERVAL_MS = 30
+
+# Directory of pre-decoded raw ARGB frames; warm starts read these
+# instead of re-running the PNG decode for pixels that never change.
+RAW_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "desktoppet")
+
 ACTIONS = {
     # --- Spawn ---
     "born": [{"img": f"born{i:05d}.png", "dur": 300} for i in range(6)],
@@ -79,6 +95,51 @@ ACTIONS = {
 }
 
 
+# States that rest on one long frame with no physics between frames;
+# when every pet is in one of these the shared timer sleeps until the
+# next frame is due instead of waking at full tick rate. wall_idle is
+# deliberately absent: its climb chance is rolled per tick, so slowing
+# its ticks would also slow the decision.
+_RESTFUL_STATES = frozenset({"idle", "sit_idle"})
+
+# Idle-time AI transitions as (choices, cumulative probabilities) per
+# state: one random draw plus a bisect replaces the chain of threshold
+# comparisons, and the odds can be tuned here without touching code.
+# "flip" turns the pet around; picking the current state keeps it.
+AI_TABLE = {
+    "idle": (("walk", "run", "sit", "flip", "idle"), (0.3, 0.35, 0.4, 0.5, 1.0)),
+    "walk": (("idle", "walk"), (0.1, 1.0)),
+    "run": (("idle", "run"), (0.1, 1.0)),
+}
+
+# Unique frame filenames, flattened once at import; pet-type registration
+# reuses this instead of re-walking the ACTIONS dict-of-lists each time.
+_UNIQUE_FRAMES = tuple({fd["img"] for fl in ACTIONS.values() for fd in fl})
+
+# ACTIONS flattened into parallel per-state tuples: the animation hot
+# path reads durations and frame names by plain tuple index instead of
+# walking the dict-of-dicts, and the right-facing lookup keys are
+# concatenated once here rather than per frame. (Plain tuples rather
+# than numpy arrays: scalar indexing of an int array boxes a numpy
+# scalar per access, which is slower than a tuple read in CPython, and
+# the pet scripts have no numpy dependency.)
+_DUR = {s: tuple(f["dur"] for f in cfg) for s, cfg in ACTIONS.items()}
+_IMG = {s: tuple(f["img"] for f in cfg) for s, cfg in ACTIONS.items()}
+_IMG_R = {s: tuple(f["img"] + "_r" for f in cfg) for s, cfg in ACTIONS.items()}
+
+# Single transparent placeholder shared by every missing frame
+# (built on first use; QPixmap needs a running QApplication).
+_placeholder = None
+
+
+def _placeholder_pixmap():
+    global _placeholder
+    if _placeholder is None:
+        _placeholder = QPixmap(128, 128)
+        _placeholder.fill(Qt.transparent)
+    return _placeholder
+
+
 # ==========================================
 # 2. Resource Singleton (SharedAssets)
 # ==========================================
@@ -89,44 +150,51 @@ class SharedAssets:
     """
     _instance = None
 
+    # PNG decode is CPU-bound, reentrant and releases the GIL, so frame
+    # decodes fan out to this pool as QImages; QPixmap construction stays
+    # on the GUI thread (QPixmap is not thread-safe per Qt docs).
+    _decode_pool = ThreadPoolExecutor(max_workers=4)
+
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super(SharedAssets, cls).__new__(cls, *args, **kwargs)
             cls._instance.initialized = False
-            cls._instance.img_cache = {}  # Dictionary to store caches for each pet type
+            cls._instance.img_cache = {}  # Per-type registration (dir + decode jobs)
             cls._instance.runcat_icons = []
+            # Pixmaps live in Qt's global cache with a real byte budget
+            # (limit is in KB); Qt evicts least-recently-used by actual
+            # uncompressed footprint, unlike an unbounded Python dict.
+            QPixmapCache.setCacheLimit(128 * 1024)
         return cls._instance
 
-    def load_pet_assets(self, pet_type, img_dir):
-        """Loads assets for a specific pet type if not already loaded."""
+    def register_pet_type(self, pet_type, img_dir):
+        """Registers where a pet type's frames live. Costs one dict insert;
+        the directory walk and decode prefetch run on first touch, so
+        registering every known type at boot stays free."""
         if pet_type in self.img_cache:
-            return  # Already loaded
+            return  # Already registered
 
         if not os.path.exists(img_dir):
             print(f"Error: Image directory not found: {img_dir}")
             return
 
-        # print(f"Loading assets for {pet_type} from {img_dir}...")
-        transform = QTransform().scale(-1, 1)  # For creating mirrored images
-        type_cache = {}
-
-        for frames_list in ACTIONS.values():
-            for frame_data in frames_list:
-                name = frame_data["img"]
-                if name in type_cache: continue
+        self.img_cache[pet_type] = {"dir": img_dir}
 
-                path = os.path.join(img_dir, name)
-                pix = QPixmap(path)
-                if pix.isNull():
-                    # Fallback to a transparent placeholder if image is missing
-                    pix = QPixmap(128, 128)
-                    pix.fill(Qt.transparent)
+    def _start_prefetch(self, entry):
+        """First touch of a pet type: one scandir pass maps name -> path
+        (replacing a per-frame join + stat), then background decodes are
+        kicked off so subsequent get_pixmap calls find warm QImages."""
+        try:
+            with os.scandir(entry["dir"]) as it:
+                dir_paths = {e.name: e.path for e in it if e.is_file()}
+        except OSError:
+            dir_paths = {}
+        entry["paths"] = dir_paths
 
-                type_cache[name] = pix
-                type_cache[name + "_r"] = pix.transformed(transform)
-
-        self.img_cache[pet_type] = type_cache
-        # print(f"Assets for {pet_type} loaded.")
+        entry["jobs"] = {
+            name: self._decode_pool.submit(self._read_image, dir_paths[name])
+            for name in _UNIQUE_FRAMES if name in dir_paths
+        }
 
     def load_runcat_icons(self):
         """Loads RunCat icons (shared)."""
@@ -145,15 +213,199 @@ class SharedAssets:
                     self.runcat_icons.append(QIcon())
 
     def get_pixmap(self, pet_type, name, look_right=False):
-        if pet_type not in self.img_cache:
+        entry = self.img_cache.get(pet_type)
+        if entry is None:
+            return None
+        if "jobs" not in entry:
+            self._start_prefetch(entry)
+
+        base_key = "pet:" + pet_type + ":" + name
+        key = base_key + ":r" if look_right else base_key
+        pix = QPixmapCache.find(key)
+        if pix is not None:
+            return pix
+
+        # Lazy load: consume the prefetched QImage (or decode inline on a
+        # cold miss / after eviction) and convert on the GUI thread.
+        # QPixmapCache may only be touched from here, never from workers.
+        base = QPixmapCache.find(base_key) if look_right else None
+        if base is None:
+            job = entry["jobs"].pop(name, None)
+            if job is not None:
+                img = job.result()
+            else:
+                path = entry["paths"].get(name) or os.path.join(entry["dir"], name)
+                img = self._read_image(path)
+            if img.isNull():
+                base = _placeholder_pixmap()
+                QPixmapCache.insert(base_key, base)
+                # A mirrored transparent placeholder is just a copy; share it.
+                return base
+            base = QPixmap.fromImage(img)
+            QPixmapCache.insert(base_key, base)
+
+            # Bake the right-facing variant now, while the decoded QImage
+            # is still at hand: prefer the pre-mirrored raw blob written on
+            # the first cold decode, else a per-scanline byte reverse of
+            # `img` (no QTransform warp, no later QPixmap round-trip).
+            # Both orientations then serve as plain cache hits per tick.
+            img_r = None
+            src_path = entry["paths"].get(name) or os.path.join(entry["dir"], name)
+            raw_path = self._raw_cache_path(src_path, mirrored=True)
+            if raw_path is not None and os.path.exists(raw_path):
+                img_r = self._load_raw(raw_path)
+            if img_r is None or img_r.isNull():
+                img_r = img.mirrored(True, False)
+            pix_r = QPixmap.fromImage(img_r)
+            QPixmapCache.insert(base_key + ":r", pix_r)
+            return pix_r if look_right else base
+
+        if not look_right:
+            return base
+
+        if base.cacheKey() == _placeholder_pixmap().cacheKey():
+            return base
+
+        # Mirrored variant was evicted while the base survived: rebuild it
+        # from the cached base rather than re-decoding the PNG.
+        pix = QPixmap.fromImage(base.toImage().mirrored(True, False))
+        QPixmapCache.insert(key, pix)
+        return pix
+
+    @staticmethod
+    def _raw_cache_path(path, mirrored=False):
+        """Cache file for a source frame, keyed by (path, mtime, size)."""
+        try:
+            st = os.stat(path)
+        except OSError:
             return None
+        tag = f"{path}|{st.st_mtime_ns}|{st.st_size}"
+        digest = hashlib.md5(tag.encode("utf-8")).hexdigest()
+        return os.path.join(RAW_CACHE_DIR, digest + ("_r.raw" if mirrored else ".raw"))
+
+    @staticmethod
+    def _load_raw(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                w, h, stride = struct.unpack("<III", f.read(12))
+                data = f.read()
+            if len(data) != stride * h:
+                return None  # truncated blob
+            img = QImage(data, w, h, stride, QImage.Format_ARGB32_Premultiplied)
+            return img.copy()  # detach from the Python buffer
+        except (OSError, struct.error):
+            return None
+
+    @staticmethod
+    def _save_raw(cache_path, img):
+        try:
+            os.makedirs(RAW_CACHE_DIR, exist_ok=True)
+            bits = img.bits()
+            bits.setsize(img.byteCount())
+            with open(cache_path, "wb") as f:
+                f.write(struct.pack("<III", img.width(), img.height(), img.bytesPerLine()))
+                f.write(bytes(bits))
+        except OSError:
+            pass  # cache is best-effort only
+
+    @classmethod
+    def _read_image(cls, path):
+        """Decodes one frame to a QImage in Qt's native display format.
+
+        Safe to run on worker threads. A raw ARGB blob cache under
+        RAW_CACHE_DIR short-circuits the PNG decode on warm starts; on a
+        cold decode both the upright and the mirrored pixels are written
+        back so later launches skip the flip as well.
+        """
+        cache_path = cls._raw_cache_path(path)
+        if cache_path is not None and os.path.exists(cache_path):
+            img = cls._load_raw(cache_path)
+            if img is not None:
+                return img
+
+        # One large buffered read replaces QImageReader's small-read
+        # pattern; decode then happens from memory via loadFromData.
+        try:
+            with open(path, "rb", buffering=1 << 20) as f:
+                buf = f.read()
+        except OSError:
+            return QImage()
+
+        img = QImage()
+        if not img.loadFromData(buf):
+            return QImage()
+        if img.format() != QImage.Format_ARGB32_Premultiplied:
+            img = img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        if cache_path is not None:
+            cls._save_raw(cache_path, img)
+            cls._save_raw(cls._raw_cache_path(path, mirrored=True),
+                          img.mirrored(True, False))
+        return img
+
+
+# ==========================================
+# 3. Hardware Monitor Worker
+# ==========================================
+class MonitorWorker(QObject):
+    """Samples the selected hardware metric off the GUI thread.
+
+    Driver calls (NVML in particular) can block for tens of ms behind a
+    CUDA context lock; sampling in a dedicated thread keeps pet painting
+    and the tray animation jitter-free. Fresh readings come back to the
+    GUI thread via the usage_updated signal.
+    """
 
-        key = name + "_r" if look_right else name
-        return self.img_cache[pet_type].get(key)
+    usage_updated = pyqtSignal(str, float)
+
+    def __init__(self, gpu_handle=None):
+        super().__init__()
+        self.mode = "cpu"
+        self.gpu_handle = gpu_handle
+        self._gpu_skip = True  # query the driver only every other tick
+        self._timer = None
+
+    @pyqtSlot()
+    def start(self):
+        # The timer has to be created here so it lives in the worker thread.
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._sample)
+        self._timer.start(1000)
+        self._sample()
+
+    @pyqtSlot(str)
+    def set_mode(self, mode):
+        self.mode = mode
+        self._sample()
+
+    def _sample(self):
+        mode = self.mode
+        if mode == "cpu":
+            usage = psutil.cpu_percent(interval=None) / 100.0
+            label = "CPU"
+        elif mode == "mem":
+            usage = psutil.virtual_memory().percent / 100.0
+            label = "MEM"
+        elif mode == "gpu" and self.gpu_handle is not None:
+            label = "GPU"
+            self._gpu_skip = not self._gpu_skip
+            if self._gpu_skip:
+                return  # reuse the last reading; GPU memory moves slowly
+            try:
+                mem = pynvml.nvmlDeviceGetMemoryInfo(self.gpu_handle)
+                usage = mem.used / mem.total
+            except:
+                usage = 0.0
+                label = "GPU Err"
+        else:
+            usage = 0.0
+            label = "None"
+
+        self.usage_updated.emit(label, usage)
 
 
 # ==========================================
-# 3. Pet Manager (PetManager)
+# 4. Pet Manager (PetManager)
 # ==========================================
 class PetManager(QSystemTrayIcon):
     """
@@ -161,14 +413,23 @@ class PetManager(QSystemTrayIcon):
     Responsible for: Tray icon, hardware monitor thread, management of all pet instances.
     """
 
+    monitor_mode_changed = pyqtSignal(str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.pets = []
+        # Hidden, already-constructed pets kept for reuse: allocating a
+        # native top-level window (CreateWindowEx / XCreateWindow) is the
+        # dominant cost of spawn_pet.
+        self._pet_pool = []
+        self._last_spawn_pos = None  # where the next tray-menu spawn appears
         self.assets = SharedAssets()
         self.app = QApplication.instance()
 
-        # Load assets for the default pet (quan)
-        self.assets.load_pet_assets("quan", DEFAULT_IMG_DIR_QUAN)
+        # Register the known pet types up front (one dict insert each);
+        # their frames load lazily on first use.
+        self.assets.register_pet_type("quan", DEFAULT_IMG_DIR_QUAN)
+        self.assets.register_pet_type("cat", DEFAULT_IMG_DIR_CAT)
         self.assets.load_runcat_icons()
 
         # --- Hardware Monitor Init ---
@@ -186,22 +447,50 @@ class PetManager(QSystemTrayIcon):
             except Exception as e:
                 print(f"GPU Init Failed: {e}")
 
+        # Precomputed lookup tables for the icon hot path: frame delay by
+        # usage quantized to 256 steps, and the successor frame index so
+        # the 5-50 Hz handler does neither float math nor a modulo.
+        self._delay_table = [max(20, int((0.2 - u / 255 * 0.18) * 1000)) for u in range(256)]
+        n_icons = len(self.assets.runcat_icons)
+        self._next_idx = [(i + 1) % n_icons for i in range(n_icons)] if n_icons else []
+
         # --- Init Tray ---
         self.init_tray_ui()
 
         # --- Start Timers ---
-        # 1. Hardware sampling timer (1 sec)
-        self.monitor_timer = QTimer(self)
-        self.monitor_timer.timeout.connect(self.update_monitor_data)
-        self.monitor_timer.start(1000)
+        # 1. Hardware sampling runs on its own thread (see MonitorWorker);
+        #    the GUI thread only receives usage_updated signals.
+        self.monitor_thread = QThread(self)
+        self.monitor_worker = MonitorWorker(self.gpu_handle)
+        self.monitor_worker.moveToThread(self.monitor_thread)
+        self.monitor_thread.started.connect(self.monitor_worker.start)
+        self.monitor_worker.usage_updated.connect(self._on_usage_updated)
+        self.monitor_mode_changed.connect(self.monitor_worker.set_mode)
+        self.app.aboutToQuit.connect(self.monitor_thread.quit)
+        self.monitor_thread.start()
+
+        # 2. One shared tick timer for every pet. Per-pet QTimers wake the
+        #    event loop N times per interval and dispatch N timeout
+        #    signals; a single timer iterating the pet list costs one
+        #    wakeup and one dispatch regardless of pet count.
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._tick_all)
+        self.timer.start(TICK_INTERVAL_MS)
 
-        # 2. Window sorting timer (500ms)
+        # 3. Window sorting timer. raise_() is a cross-process WM call per
+        #    pet, so poll at 2 s instead of 500 ms; stacking drifts slowly
+        #    enough that this is imperceptible, and sort_windows bails out
+        #    when there is nothing to restack.
         self.sort_timer = QTimer(self)
         self.sort_timer.timeout.connect(self.sort_windows)
-        self.sort_timer.start(500)
+        self.sort_timer.start(2000)
 
-        # 3. Start RunCat animation
-        self.update_runcat_icon()
+        # 4. RunCat animation: one persistent timer whose interval is
+        #    retuned from update_monitor_data, instead of re-allocating a
+        #    singleShot QTimer for every icon frame.
+        self.runcat_timer = QTimer(self)
+        self.runcat_timer.timeout.connect(self._advance_runcat)
+        self.runcat_timer.start(200)
 
     def init_tray_ui(self):
         # Set default icon (using 'quan' idle image)
@@ -470,13 +759,33 @@ class PetManager(QSystemTrayIcon):
         self.pets.append(pet)
 
     def remove_pet(self, pet):
-        if pet in self.pets:
+        # Single O(n) remove instead of the double scan of `in` + remove.
+        try:
             self.pets.remove(pet)
+        except ValueError:
+            return
+        self._pool_pet(pet)
+
+    def _pool_pet(self, pet):
+        """Parks a despawned pet on the free list if there is room."""
+        if len(self._pet_pool) >= max(1, MAX_PETS // 2):
+            return False
+        # Pooled pets are off self.pets, so the shared timer skips them.
+        pet.hide()
+        self._pet_pool.append(pet)
+        return True
 
     def remove_all_pets(self):
-        """Clears all pets."""
-        for pet in self.pets[:]:
-            pet.close()
+        """Clears all pets.
+
+        Swap the list out first: a close() per pet would round-trip
+        through closeEvent -> remove_pet and make teardown quadratic.
+        """
+        pets, self.pets = self.pets, []
+        for pet in pets:
+            if not self._pool_pet(pet):
+                pet.hide()
+                pet.deleteLater()
 
     def spawn_pet(self, source_x=None, source_y=None, pet_type="quan"):
         """
@@ -490,76 +799,133 @@ class PetManager(QSystemTrayIcon):
             print(f"Cannot spawn: Max pets limit ({MAX_PETS}) reached.")
             return
 
-        # Ensure assets for this type are loaded
-        if pet_type == "cat":
-            self.assets.load_pet_assets("cat", DEFAULT_IMG_DIR_CAT)
-        elif pet_type == "quan":
-            self.assets.load_pet_assets("quan", DEFAULT_IMG_DIR_QUAN)
-
         start_x, start_y = None, None
 
         # Priority 1: Use specific coordinates (from right-click)
         if source_x is not None and source_y is not None:
             start_x, start_y = source_x + 20, source_y - 20
-        # Priority 2: Use first pet's location as reference
-        elif self.pets:
-            target = self.pets[0]
-            start_x, start_y = target.x + 20, target.y - 20
-
-        new_pet = DesktopPet(self, pet_type=pet_type, start_pos=(start_x, start_y) if start_x else None,
-                             start_state="drop")
+        # Priority 2: Continue from the last spawn point — avoids both the
+        # attribute reach-through into pets[0] and the "everything clumps
+        # around the first pet" behaviour it produced.
+        elif self._last_spawn_pos is not None:
+            start_x, start_y = self._last_spawn_pos
+
+        start_pos = (start_x, start_y) if start_x else None
+        if self._pet_pool:
+            new_pet = self._pet_pool.pop()
+            new_pet.reset_state(pet_type=pet_type, start_pos=start_pos, start_state="drop")
+            new_pet.show()
+        else:
+            new_pet = DesktopPet(self, pet_type=pet_type, start_pos=start_pos,
+                                 start_state="drop")
         new_pet.vx = random.choice([-2, 2])
         new_pet.vy = -5
         self.add_pet(new_pet)
+        self._last_spawn_pos = (new_pet.x + 20, new_pet.y - 20)
+
+    def _tick_all(self):
+        """Advances every live pet from the single shared timer.
+
+        Iterates a snapshot because a tick can mutate the list (born
+        spawns a clone, closeEvent removes). One pet raising must not
+        stall the others, so failures are confined per pet.
+        """
+        pets = list(self.pets)
+        for pet in pets:
+            try:
+                pet.update_tick()
+            except Exception as e:
+                print(f"Pet tick failed: {e}")
+
+        # With every pet resting on a long-dur frame there is nothing to
+        # animate or move until the earliest frame comes due, so stretch
+        # the interval (capped at 250 ms so interaction and state changes
+        # are picked up promptly). Frame timing is wall-clock based, so a
+        # longer interval never slows playback. Mouse events do not go
+        # through the timer and stay responsive regardless.
+        interval = TICK_INTERVAL_MS
+        if pets and all(p.state in _RESTFUL_STATES for p in pets):
+            due = min(p._current_dur - p.frame_timer for p in pets)
+            interval = max(16, min(250, int(due)))
+        if interval != self.timer.interval():
+            self.timer.setInterval(interval)
 
     def sort_windows(self):
+        if not self.pets:
+            return
         for pet in self.pets:
             pet.raise_()
 
     def set_monitor_mode(self, mode):
         self.monitor_mode = mode
-        self.update_monitor_data()
-
-    def update_monitor_data(self):
-        if self.monitor_mode == "cpu":
-            self.current_usage = psutil.cpu_percent(interval=None) / 100.0
-            label = "CPU"
-        elif self.monitor_mode == "mem":
-            self.current_usage = psutil.virtual_memory().percent / 100.0
-            label = "MEM"
-        elif self.monitor_mode == "gpu" and self.has_gpu:
-            try:
-                mem = pynvml.nvmlDeviceGetMemoryInfo(self.gpu_handle)
-                self.current_usage = mem.used / mem.total
-                label = "GPU"
-            except:
-                self.current_usage = 0.0
-                label = "GPU Err"
-        else:
-            self.current_usage = 0.0
-            label = "None"
-
-        self.setToolTip(f"{label}: {self.current_usage:.1%}")
-
-    def update_runcat_icon(self):
+        # Queued across the thread boundary; the worker resamples at once.
+        self.monitor_mode_changed.emit(mode)
+
+    def _on_usage_updated(self, label, usage):
+        """Runs on the GUI thread with a fresh sample from the worker."""
+        self.current_usage = usage
+
+        # The tooltip only renders while the cursor hovers the tray icon;
+        # skip the format + IPC otherwise. Platforms that report no tray
+        # geometry keep the old always-update behaviour.
+        geo = self.geometry()
+        if geo.isNull() or geo.contains(QCursor.pos()):
+            self.setToolTip(f"{label}: {usage:.1%}")
+
+        # Higher usage -> faster cat; leave the timer alone when unchanged.
+        delay_ms = self._delay_table[min(255, int(usage * 255))]
+        if delay_ms != self.runcat_timer.interval():
+            self.runcat_timer.setInterval(delay_ms)
+
+    def _advance_runcat(self):
         icons = self.assets.runcat_icons
         if not icons: return
 
         self.setIcon(icons[self.runcat_frame_index])
-        self.runcat_frame_index = (self.runcat_frame_index + 1) % len(icons)
-
-        # Delay algorithm
-        delay_sec = 0.2 - (self.current_usage * 0.18)
-        delay_ms = int(delay_sec * 1000)
-        if delay_ms < 20: delay_ms = 20
-
-        QTimer.singleShot(delay_ms, self.update_runcat_icon)
+        self.runcat_frame_index = self._next_idx[self.runcat_frame_index]
 
 
 # ==========================================
-# 4. Desktop Pet Class
+# 5. Desktop Pet Class
 # ==========================================
 class DesktopPet(QMainWindow):
+    # Position and velocity are stored as integers in 8-bit-fraction
+    # fixed point (_x_q = x * 256). The air physics then runs on integer
+    # adds and shifts with no float math or int() casts at move() time;
+    # these properties keep every other reader/writer (manager, mouse
+    # handlers, wall/floor clamps) on plain pixel coordinates.
+    @property
+    def x(self):
+        return self._x_q >> 8
+
+    @x.setter
+    def x(self, v):
+        self._x_q = int(v) << 8
+
+    @property
+    def y(self):
+        return self._y_q >> 8
+
+    @y.setter
+    def y(self, v):
+        self._y_q = int(v) << 8
+
+    @property
+    def vx(self):
+        return self._vx_q / 256.0
+
+    @vx.setter
+    def vx(self, v):
+        self._vx_q = int(v * 256)
+
+    @property
+    def vy(self):
+        return self._vy_q / 256.0
+
+    @vy.setter
+    def vy(self, v):
+        self._vy_q = int(v * 256)
+
     def __init__(self, manager, pet_type="quan", start_pos=None, start_state="drop"):
         super().__init__()
         self.manager = manager
@@ -571,8 +937,20 @@ class DesktopPet(QMainWindow):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_ShowWithoutActivating)
 
+        # Frames are hosted in a QLabel child: setPixmap goes through
+        # Qt's backing-store dirty-region path, so a frame change needs
+        # no custom QPainter setup or whole-widget paintEvent.
+        self.label = QLabel(self)
+        self.label.setAttribute(Qt.WA_TransparentForMouseEvents)
+
         # --- Screen Management ---
         self.desktop = QApplication.desktop()
+        # Monitor layout changes arrive as signals; the per-tick poll
+        # below only has to track the pet wandering between screens and
+        # can therefore run at a fraction of the tick rate.
+        self._screen_tick = 0
+        self.desktop.resized.connect(self._on_screens_changed)
+        self.desktop.screenCountChanged.connect(self._on_screens_changed)
         if start_pos:
             self.x, self.y = start_pos
         else:
@@ -596,25 +974,75 @@ class DesktopPet(QMainWindow):
         # Animation
         self.frame_index = 0
         self.frame_timer = 0
+        self._last_tick = time.monotonic()
+        # Action config is resolved once per state transition; the tick
+        # path then reads plain attributes instead of ACTIONS.get per call.
+        self._bind_action(self.state)
+        # Inline pixmap cache specialised to this pet's type: one dict hit
+        # per frame instead of going through SharedAssets.get_pixmap.
+        self._pix_memo = {}
+        # Key of the frame currently on screen; most 30 ms ticks land on
+        # the same frame (dur is usually > 30 ms), so update_image bails
+        # out after one string compare instead of re-resolving the pixmap
+        # and scheduling a repaint of identical pixels.
+        self._last_key = None
 
         # Interaction
         self.is_dragging = False
-        self.mouse_history = []
+        # maxlen evicts the oldest sample in O(1); a list's pop(0) shifts
+        # every element at mouse-move rates.
+        self.mouse_history = deque(maxlen=6)
         self.drag_offset = QPoint(0, 0)
         self.last_drag_x = 0
         self.ceiling_dist = 0
 
-        # --- Timer ---
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_tick)
-        self.timer.start(30)
-
+        # Ticking is driven by the manager's shared timer (see
+        # PetManager._tick_all); pets own no QTimer of their own.
         self.update_image()
-        self.move(int(self.x), int(self.y))
+        self.move(self.x, self.y)
         self.show()
 
+    def reset_state(self, pet_type="quan", start_pos=None, start_state="drop"):
+        """Reinitializes a pooled pet without tearing down the native window."""
+        if pet_type != self.pet_type:
+            self._pix_memo.clear()  # memo is specialised to the old type
+        self.pet_type = pet_type
+
+        if start_pos:
+            self.x, self.y = start_pos
+        else:
+            primary_rect = self.desktop.availableGeometry(self.desktop.primaryScreen())
+            self.x = primary_rect.center().x() - 64
+            self.y = primary_rect.top() - 128
+        self.update_screen_info(force_update=True)
+
+        self.state = start_state
+        self.look_right = True
+        self.vx = 0
+        self.vy = 0
+        self.is_fixed = False
+        self.wander_mode = None
+        self.frame_index = 0
+        self.frame_timer = 0
+        self._last_tick = time.monotonic()  # pooled pets must not "catch up" idle time
+        self._bind_action(self.state)
+        self.is_dragging = False
+        self.mouse_history = deque(maxlen=6)
+        self.ceiling_dist = 0
+        # Frame names repeat across types, so the stale key must not
+        # suppress the first repaint after a type switch.
+        self._last_key = None
+
+        self.update_image()
+        self.move(self.x, self.y)
+
     def update_tick(self):
-        self.update_screen_info()
+        # screenNumber/availableGeometry walk every monitor's geometry;
+        # polling at every 8th tick (~4 Hz) is plenty to catch the pet
+        # crossing a screen edge, and layout changes refresh via signal.
+        self._screen_tick = (self._screen_tick + 1) & 7
+        if self._screen_tick == 0:
+            self.update_screen_info()
         self.update_animation_frame()
 
         if self.is_dragging:
@@ -640,38 +1068,51 @@ class DesktopPet(QMainWindow):
         if self.is_fixed and self.state not in ["fly", "drop", "drag_throw"]:
             pass
         else:
-            self.move(int(self.x), int(self.y))
+            self.move(self.x, self.y)
 
     def update_image(self):
-        conf = ACTIONS.get(self.state, ACTIONS["idle"])
-        if self.frame_index >= len(conf): self.frame_index = 0
+        idx = self.frame_index
+        if idx >= self._action_len: idx = self.frame_index = 0
 
-        img_name = conf[self.frame_index]["img"]
-        # Request image for this specific pet type
-        pix = self.assets.get_pixmap(self.pet_type, img_name, self.look_right)
+        key = (self._action_imgs_r if self.look_right else self._action_imgs)[idx]
+        if key == self._last_key:
+            return  # same frame, same direction: nothing to redraw
 
-        if pix:
-            self.pixmap = pix
-            self.resize(pix.size())
-            self.update()
+        pix = self._pix_memo.get(key)
+        if pix is None:
+            pix = self.assets.get_pixmap(self.pet_type, self._action_imgs[idx], self.look_right)
+            if pix is not None:
+                self._pix_memo[key] = pix
 
-    def paintEvent(self, event):
-        if hasattr(self, 'pixmap'):
-            painter = QPainter(self)
-            painter.drawPixmap(0, 0, self.pixmap)
+        if pix:
+            if pix.size() != self.size():
+                self.resize(pix.size())
+                self.label.resize(pix.size())
+            self.label.setPixmap(pix)
+            self._last_key = key
 
     def update_animation_frame(self):
-        conf = ACTIONS.get(self.state, ACTIONS["idle"])
-        current_frame = conf[self.frame_index]
-
-        self.frame_timer += 30
-        if self.frame_timer >= current_frame["dur"]:
-            self.frame_timer = 0
-            self.frame_index = (self.frame_index + 1)
-
-            if self.frame_index >= len(conf):
+        # Advance on measured wall-clock time, not an assumed 30 ms per
+        # tick: QTimer drifts under load, and the shared timer interval
+        # may be retuned. The cap keeps a long stall (sleep, debugger)
+        # from replaying a burst of catch-up frames.
+        now = time.monotonic()
+        elapsed = (now - self._last_tick) * 1000.0
+        self._last_tick = now
+        self.frame_timer += elapsed if elapsed < 1000.0 else 1000.0
+
+        current_dur = self._current_dur
+        while self.frame_timer >= current_dur:
+            self.frame_timer -= current_dur
+            self.frame_index += 1
+
+            if self.frame_index >= self._action_len:
                 self.frame_index = 0
                 self.on_action_finished()
+                # on_action_finished may have switched state (and with it
+                # the bound tuples, via set_state); re-read before looping.
+            current_dur = self._action_durs[self.frame_index]
+            self._current_dur = current_dur
         self.update_image()
 
     def on_action_finished(self):
@@ -701,18 +1142,16 @@ class DesktopPet(QMainWindow):
             if self.state != "idle": self.set_state("idle")
             return
 
-        r = random.random()
-        if self.state == "idle":
-            if r < 0.3:
-                self.set_state("walk")
-            elif r < 0.35:
-                self.set_state("run")
-            elif r < 0.4:
-                self.set_state("sit")
-            elif r < 0.5:
-                self.look_right = not self.look_right
-        elif self.state in ["walk", "run"]:
-            if r < 0.1: self.set_state("idle")
+        table = AI_TABLE.get(self.state)
+        if table is None:
+            return  # states without an entry (e.g. ie_walk) just loop
+
+        choices, cum = table
+        action = choices[bisect.bisect(cum, random.random())]
+        if action == "flip":
+            self.look_right = not self.look_right
+        elif action != self.state:
+            self.set_state(action)
 
     def set_state(self, new_state):
         if self.state == new_state: return
@@ -720,12 +1159,24 @@ class DesktopPet(QMainWindow):
         self.state = new_state
         self.frame_index = 0
         self.frame_timer = 0
+        self._bind_action(new_state)
         self.update_image()
 
+    def _bind_action(self, state):
+        """Points the per-pet animation fields at the flattened tuples
+        for `state` (falling back to idle for unknown states)."""
+        if state not in _DUR:
+            state = "idle"
+        self._action_durs = _DUR[state]
+        self._action_imgs = _IMG[state]
+        self._action_imgs_r = _IMG_R[state]
+        self._action_len = len(self._action_durs)
+        self._current_dur = self._action_durs[0]
+
     # --- Helper methods ---
     def snap_to_nearest_wall(self):
-        left_wall_x = self.screen_rect.left()
-        right_wall_x = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+        left_wall_x = self._rect_left
+        right_wall_x = self._rect_right_wall
 
         dist_left = abs(self.x - left_wall_x)
         dist_right = abs(self.x - right_wall_x)
@@ -744,48 +1195,63 @@ class DesktopPet(QMainWindow):
         self.set_state("wall_climb")
 
     # --- Physics Logic ---
+    def _on_screens_changed(self):
+        """A monitor was (un)plugged or resized; re-resolve immediately."""
+        self.update_screen_info(force_update=True)
+
     def update_screen_info(self, force_update=False):
         if not force_update and self.state in ["wall_climb", "wall_descend", "wall_idle", "ceiling_walk"]:
             return
-        pet_center = QPoint(int(self.x + 64), int(self.y + 64))
+        pet_center = QPoint(self.x + 64, self.y + 64)
         screen_num = self.desktop.screenNumber(pet_center)
         rect = self.desktop.availableGeometry(screen_num)
         if force_update or getattr(self, 'screen_rect', None) != rect:
             self.screen_rect = rect
+            # Plain-int copies of the bounds the physics methods read
+            # several times per tick; each .left()/.bottom() call would
+            # otherwise cross the PyQt binding layer.
+            self._rect_left = rect.left()
+            self._rect_right_wall = rect.right() - 128 - RIGHT_WALL_OFFSET
+            self._rect_top = rect.top()
+            self._floor_y = rect.bottom() - 128 - FLOOR_OFFSET
+            self._bottom_respawn = rect.bottom() - 80
 
     def respawn_at_top(self):
         self.x = self.screen_rect.center().x() - 64
-        self.y = self.screen_rect.top() - 128
+        self.y = self._rect_top - 128
         self.vx = 0;
         self.vy = 2
         self.set_state("drop")
 
     def update_physics_air(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        self.vx *= 0.98
-
-        if self.vx < -2:
+        # Integrate directly on the fixed-point fields: integer adds and
+        # one mul+shift. 250/256 ≈ 0.977 stands in for the old 0.98
+        # damping — visually indistinguishable over a throw.
+        self._x_q += self._vx_q
+        self._y_q += self._vy_q
+        self._vy_q += self.gravity << 8
+        self._vx_q = (self._vx_q * 250) >> 8
+
+        vx_q = self._vx_q
+        if vx_q < -512:  # vx < -2 px/tick
             if self.state != "fly": self.set_state("fly"); self.look_right = False
-        elif self.vx > 2:
+        elif vx_q > 512:
             if self.state != "drag_throw": self.set_state("drag_throw"); self.look_right = True
         else:
             if self.state not in ["drop"]: self.set_state("drop")
 
-        if self.y > self.screen_rect.bottom() - 80:
+        if self.y > self._bottom_respawn:
             self.respawn_at_top()
             return
 
-        floor_y = self.screen_rect.bottom() - 128 - FLOOR_OFFSET
-        if self.y >= floor_y:
-            self.y = floor_y
+        if self.y >= self._floor_y:
+            self.y = self._floor_y
             self.vx = 0;
             self.vy = 0
             self.set_state("idle")
 
-        left = self.screen_rect.left()
-        right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+        left = self._rect_left
+        right = self._rect_right_wall
         if self.x <= left:
             self.x = left;
             self.vx = 0;
@@ -800,8 +1266,8 @@ class DesktopPet(QMainWindow):
             self.set_state("wall_idle")
 
     def update_physics_wall(self):
-        left = self.screen_rect.left()
-        right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+        left = self._rect_left
+        right = self._rect_right_wall
 
         if self.x < left + 64:
             self.x = left;
@@ -812,14 +1278,13 @@ class DesktopPet(QMainWindow):
 
         if self.state == "wall_climb":
             if not self.is_fixed: self.y -= 5
-            if self.y <= self.screen_rect.top():
-                self.y = self.screen_rect.top()
+            if self.y <= self._rect_top:
+                self.y = self._rect_top
                 self.to_ceiling(left, right)
         elif self.state == "wall_descend":
             if not self.is_fixed: self.y += 5
-            floor_y = self.screen_rect.bottom() - 128 - FLOOR_OFFSET
-            if self.y >= floor_y:
-                self.y = floor_y
+            if self.y >= self._floor_y:
+                self.y = self._floor_y
                 self.set_state("idle")
         elif self.state == "wall_idle":
             if random.random() < 0.02: self.set_state("wall_climb")
@@ -834,7 +1299,7 @@ class DesktopPet(QMainWindow):
             self.look_right = False
 
     def update_physics_ceiling(self):
-        self.y = self.screen_rect.top()
+        self.y = self._rect_top
         speed = 3
         if self.is_fixed: speed = 0
         self.x += speed if self.look_right else -speed
@@ -845,8 +1310,8 @@ class DesktopPet(QMainWindow):
             self.vy = 0;
             return
 
-        left = self.screen_rect.left()
-        right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+        left = self._rect_left
+        right = self._rect_right_wall
         if self.x <= left:
             self.x = left
             if self.wander_mode == "ceiling":
@@ -872,8 +1337,8 @@ class DesktopPet(QMainWindow):
             if self.is_fixed: speed = 0
             self.x += speed if self.look_right else -speed
 
-            left = self.screen_rect.left()
-            right = self.screen_rect.right() - 128 - RIGHT_WALL_OFFSET
+            left = self._rect_left
+            right = self._rect_right_wall
             if self.x <= left:
                 self.x = left;
                 self.look_right = False
@@ -893,7 +1358,7 @@ class DesktopPet(QMainWindow):
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.is_dragging = True
-            self.mouse_history = []
+            self.mouse_history.clear()
             self.drag_offset = event.globalPos() - self.frameGeometry().topLeft()
             self.last_drag_x = event.globalPos().x()
             self.raise_()
@@ -917,10 +1382,9 @@ class DesktopPet(QMainWindow):
 
             self.x = new_pos.x()
             self.y = new_pos.y()
-            self.move(int(self.x), int(self.y))
+            self.move(self.x, self.y)
 
             self.mouse_history.append(g_pos)
-            if len(self.mouse_history) > 6: self.mouse_history.pop(0)
             event.accept()
 
     def mouseReleaseEvent(self, event):
@@ -1021,7 +1485,7 @@ class DesktopPet(QMainWindow):
 
 
 # ==========================================
-# 5. Main Entry Point
+# 6. Main Entry Point
 # ==========================================
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -1,4 +1,6 @@
 import os
+import math
+import multiprocessing
 import cv2
 import numpy as np
 from PIL import Image, ImageEnhance
@@ -25,17 +27,25 @@ def strict_crop(img_pil):
         img_data = np.array(img_pil)
 
     alpha = img_data[:, :, 3]
-    coords = np.argwhere(alpha > 10)
 
-    if coords.size == 0:
+    # 行/列 any 归约直接得到包围盒，省去 argwhere 的坐标大数组
+    mask = alpha > 10
+    rows = np.any(mask, axis=1)
+    cols = np.any(mask, axis=0)
+
+    if not rows.any():
         return img_pil
 
-    y0, x0 = coords.min(axis=0)
-    y1, x1 = coords.max(axis=0) + 1
+    y0 = int(np.argmax(rows))
+    y1 = len(rows) - int(np.argmax(rows[::-1]))
+    x0 = int(np.argmax(cols))
+    x1 = len(cols) - int(np.argmax(cols[::-1]))
     return img_pil.crop((x0, y0, x1, y1))
 
 
-def process_single_image(file_path, save_path):
+def process_single_image(job):
+    # 接收 (源路径, 目标路径) 元组，方便 multiprocessing 分发
+    file_path, save_path = job
     try:
         img_pil = Image.open(file_path).convert("RGBA")
 
@@ -45,11 +55,17 @@ def process_single_image(file_path, save_path):
         # 2. 【核心优化】放大处理 (Super-sampling)
         # 我们先计算一个很大的“工作尺寸”，比如 512x512
         # 在大图上提取线条，锯齿会变小，断裂会减少
-        work_w = TARGET_SIZE[0] * PROCESS_SCALE
-        work_h = TARGET_SIZE[1] * PROCESS_SCALE
+        # 原图本身够大时不必放大到满 4 倍：滤波/阈值/形态学的工作量
+        # 随像素数线性增长，4 倍分辨率就是 16 倍像素，
+        # 源图已有足够细节时按需降低工作倍率
+        scale = max(1, min(PROCESS_SCALE,
+                           math.ceil(TARGET_SIZE[0] / min(img_pil.width, img_pil.height) * 1.5)))
+
+        work_w = TARGET_SIZE[0] * scale
+        work_h = TARGET_SIZE[1] * scale
 
         # 计算缩放比例 (保持长宽比，留出 padding)
-        padding = 10 * PROCESS_SCALE
+        padding = 10 * scale
         draw_w, draw_h = work_w - padding, work_h - padding
 
         ratio = min(draw_w / img_pil.width, draw_h / img_pil.height)
@@ -112,9 +128,9 @@ def process_single_image(file_path, save_path):
         # 9. 【核心优化】下采样 (Downsampling)
         # 将处理完美的 512x512 大图缩小回 128x128
         # INTER_AREA 是抗锯齿效果最好的缩小算法，它会让线条看起来无比顺滑
-        final_rgb = cv2.resize(img_lines_large, (new_w // PROCESS_SCALE, new_h // PROCESS_SCALE),
+        final_rgb = cv2.resize(img_lines_large, (new_w // scale, new_h // scale),
                                interpolation=cv2.INTER_AREA)
-        final_mask = cv2.resize(mask, (new_w // PROCESS_SCALE, new_h // PROCESS_SCALE), interpolation=cv2.INTER_AREA)
+        final_mask = cv2.resize(mask, (new_w // scale, new_h // scale), interpolation=cv2.INTER_AREA)
 
         # 10. 组装最终 PIL 图片
         img_final = Image.fromarray(final_rgb)
@@ -136,7 +152,7 @@ def process_single_image(file_path, save_path):
         final_canvas = enhancer.enhance(1.5)
 
         final_canvas.save(save_path)
-        print(f"处理成功 (Super-sampling x{PROCESS_SCALE}): {os.path.basename(file_path)}")
+        print(f"处理成功 (Super-sampling x{scale}): {os.path.basename(file_path)}")
 
     except Exception as e:
         print(f"处理出错 {file_path}: {e}")
@@ -148,14 +164,21 @@ def main():
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
 
-    print(f"开始处理... (工作分辨率: {TARGET_SIZE[0] * PROCESS_SCALE}x{TARGET_SIZE[1] * PROCESS_SCALE})")
+    # 每张图互相独立，按文件并行分发到多个进程
+    jobs = []
     for root, dirs, files in os.walk(INPUT_DIR):
         for file in files:
             if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                process_single_image(
+                jobs.append((
                     os.path.join(root, file),
                     os.path.join(OUTPUT_DIR, file)
-                )
+                ))
+
+    print(f"开始处理... (工作分辨率: {TARGET_SIZE[0] * PROCESS_SCALE}x{TARGET_SIZE[1] * PROCESS_SCALE}，"
+          f"共 {len(jobs)} 张，{os.cpu_count()} 进程并行)")
+    with multiprocessing.Pool(os.cpu_count()) as pool:
+        for _ in pool.imap_unordered(process_single_image, jobs, chunksize=4):
+            pass
     print("完成。")
 
 